@@ -1,35 +1,239 @@
 import os
+import threading
+import itertools
+import concurrent.futures
+from collections import OrderedDict, namedtuple
 import mutagen
-from mutagen.easyid3 import EasyID3
+from mutagen.id3 import ID3
+from mutagen.mp4 import MP4Tags
+
+SUPPORTED_EXTENSIONS = frozenset(('.mp3', '.flac', '.m4a', '.ogg', '.wav'))
+SUPPORTED_EXT_TUPLE = tuple(SUPPORTED_EXTENSIONS) # For str.endswith
+
+# Yields files as the tree is walked so tag reads can start before the scan
+# ends; each directory is listed in name order to keep runs stable
+def find_audio_files(path):
+    try:
+        with os.scandir(path) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except OSError:
+        return # Unreadable directory, skip it
+
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            yield from find_audio_files(entry.path)
+        else:
+            # Most names are already lowercase; only lower() the rest
+            name = entry.name
+            if name.endswith(SUPPORTED_EXT_TUPLE) or name.lower().endswith(SUPPORTED_EXT_TUPLE):
+                yield entry.path
+
+# Tag dicts built by get_tags are kept per track so batch passes and row
+# refreshes skip the parse; entries are validated against mtime and size.
+# Parsed mutagen objects are not kept, they hold the embedded artwork. Of
+# the artwork itself only the last cover read is kept, which covers the
+# editor showing a track and then resizing its cover.
+_CACHE_SIZE = 1024
+_READ_BUFFER_SIZE = 64 * 1024
+_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+_READ_CHUNK = 256
+_tags_cache = OrderedDict()
+_last_cover = (None, None, None) # (path, stamp, data)
+_cache_lock = threading.Lock()
+
+def _stamp(filepath):
+    st = os.stat(filepath)
+    return (st.st_mtime_ns, st.st_size)
+
+def _load(filepath):
+    # Tags and artwork sit at the head of the file; a larger read buffer
+    # turns mutagen's many small reads into a few large ones, which is what
+    # matters on network shares.
+    with open(filepath, 'rb', buffering=_READ_BUFFER_SIZE) as f:
+        return mutagen.File(f)
+
+def _cached_tags(filepath, stamp):
+    with _cache_lock:
+        hit = _tags_cache.get(filepath)
+        if hit and hit[0] == stamp:
+            _tags_cache.move_to_end(filepath)
+            return dict(hit[1])
+    return None
+
+def _store_tags(filepath, stamp, tags):
+    with _cache_lock:
+        _tags_cache[filepath] = (stamp, dict(tags))
+        _tags_cache.move_to_end(filepath)
+        while len(_tags_cache) > _CACHE_SIZE:
+            _tags_cache.popitem(last=False)
+
+def _invalidate(filepath):
+    global _last_cover
+    with _cache_lock:
+        _tags_cache.pop(filepath, None)
+        if _last_cover[0] == filepath:
+            _last_cover = (None, None, None)
+
+# Basic fields written by save_tags
+TAG_FIELDS = ("title", "artist", "album", "albumartist", "year", "genre")
+
+# Tag dict keys whose mutagen "easy" key differs
+EASY_KEYS = {"year": "date"}
+
+# ID3 text frames behind the easy keys, for writing MP3 tags in one pass
+ID3_TEXT_FRAMES = {
+    "title": "TIT2",
+    "artist": "TPE1",
+    "album": "TALB",
+    "albumartist": "TPE2",
+    "year": "TDRC",
+    "genre": "TCON",
+}
+
+# MP4 atoms behind the easy keys
+MP4_TEXT_KEYS = {
+    "title": "\xa9nam",
+    "artist": "\xa9ART",
+    "album": "\xa9alb",
+    "albumartist": "aART",
+    "year": "\xa9day",
+    "genre": "\xa9gen",
+}
+
+# Reads TAG_FIELDS from the full (non-easy) object, saving a second
+# easy=True parse of the same file just for these fields
+def _read_basic_tags(audio):
+    values = dict.fromkeys(TAG_FIELDS, "")
+    tags = audio.tags
+    if tags is None:
+        return values
+    
+    if isinstance(tags, ID3):
+        for key, frame_id in ID3_TEXT_FRAMES.items():
+            frame = tags.get(frame_id)
+            if frame and frame.text:
+                # TCON may hold ID3v1 genre numbers like '(17)'; genres resolves them
+                values[key] = frame.genres[0] if frame_id == "TCON" and frame.genres else str(frame.text[0])
+        original = tags.get("TDOR")
+        if not values["year"] and original and original.text:
+            values["year"] = str(original.text[0])
+    elif isinstance(tags, MP4Tags):
+        for key, atom in MP4_TEXT_KEYS.items():
+            if tags.get(atom):
+                values[key] = str(tags[atom][0])
+    else:
+        # Vorbis comments (FLAC, Ogg, Opus) already use the easy key names
+        for key in TAG_FIELDS:
+            found = tags.get(EASY_KEYS.get(key, key))
+            if found:
+                values[key] = found[0]
+        if not values["year"] and tags.get("originaldate"):
+            values["year"] = tags.get("originaldate")[0]
+    return values
+
+# ID3 frame IDs; frames are keyed as '<ID>' or '<ID>:<desc>:<lang>'
+ID3_COVER = 'APIC'
+ID3_LYRICS = 'USLT'
+ID3_SYNCED_LYRICS = 'SYLT'
+
+# --- Per-format cover/lyrics access ---
+# Each helper works on an already loaded mutagen object; AudioHandler picks
+# the right set with a single lookup on the file extension.
+
+def _id3_get_cover(audio):
+    if audio.tags:
+        for frame in audio.tags.getall(ID3_COVER):
+            return frame.data
+    return None
+
+def _id3_set_cover(audio, image_data, mime_type):
+    from mutagen.id3 import APIC
+    if not audio.tags: audio.add_tags()
+    audio.tags.add(APIC(encoding=3, mime=mime_type, type=3, desc='Cover', data=image_data))
+
+def _id3_get_lyrics(audio):
+    if audio.tags:
+        for frame in audio.tags.getall(ID3_LYRICS):
+            return frame.text
+    return ""
+
+def _id3_set_lyrics(audio, lyrics):
+    from mutagen.id3 import USLT
+    if not audio.tags: audio.add_tags()
+    audio.tags.add(USLT(encoding=3, lang='eng', desc='', text=lyrics))
+
+def _flac_get_cover(audio):
+    if audio.pictures:
+        return audio.pictures[0].data
+    return None
+
+def _flac_set_cover(audio, image_data, mime_type):
+    from mutagen.flac import Picture
+    pic = Picture()
+    pic.type = 3
+    pic.mime = mime_type
+    pic.desc = 'Cover'
+    pic.data = image_data
+    audio.clear_pictures()
+    audio.add_picture(pic)
+
+def _flac_get_lyrics(audio):
+    if 'lyrics' in audio:
+        return audio['lyrics'][0]
+    return ""
+
+def _flac_set_lyrics(audio, lyrics):
+    audio['lyrics'] = [lyrics]
+
+def _mp4_get_cover(audio):
+    if audio.tags and 'covr' in audio.tags:
+        return bytes(audio.tags['covr'][0])
+    return None
+
+def _mp4_set_cover(audio, image_data, mime_type):
+    from mutagen.mp4 import MP4Cover
+    fmt = MP4Cover.FORMAT_JPEG if mime_type == 'image/jpeg' else MP4Cover.FORMAT_PNG
+    audio.tags['covr'] = [MP4Cover(image_data, imageformat=fmt)]
+
+def _mp4_get_lyrics(audio):
+    if audio.tags and '\xa9lyr' in audio.tags:
+        return audio.tags['\xa9lyr'][0]
+    return ""
+
+def _mp4_set_lyrics(audio, lyrics):
+    audio.tags['\xa9lyr'] = [lyrics]
+
+FormatHandlers = namedtuple('FormatHandlers', 'get_cover set_cover get_lyrics set_lyrics')
+
+FORMAT_HANDLERS = {
+    '.mp3': FormatHandlers(_id3_get_cover, _id3_set_cover, _id3_get_lyrics, _id3_set_lyrics),
+    '.flac': FormatHandlers(_flac_get_cover, _flac_set_cover, _flac_get_lyrics, _flac_set_lyrics),
+    '.m4a': FormatHandlers(_mp4_get_cover, _mp4_set_cover, _mp4_get_lyrics, _mp4_set_lyrics),
+}
 
 class AudioHandler:
     def get_tags(self, filepath):
+        ext = os.path.splitext(filepath)[1].lower()
         try:
-            audio = mutagen.File(filepath, easy=True)
-            if not audio:
+            stamp = _stamp(filepath)
+            cached = _cached_tags(filepath, stamp)
+            if cached is not None:
+                return cached
+            
+            audio_full = _load(filepath)
+            if not audio_full:
                 return {"filename": os.path.basename(filepath), "path": filepath}
                 
             tags = {
                 "filename": os.path.basename(filepath),
-                "title": audio.get("title", [""])[0],
-                "artist": audio.get("artist", [""])[0],
-                "album": audio.get("album", [""])[0],
-                "albumartist": audio.get("albumartist", [""])[0],
-                "year": audio.get("date", [""])[0],
-                "genre": audio.get("genre", [""])[0],
+                **_read_basic_tags(audio_full),
                 "path": filepath,
                 "cover_status": 0,
                 "lyrics_status": 0
             }
-            
-            # Fallback for year/date if empty
-            if not tags["year"] and "originaldate" in audio:
-                tags["year"] = audio.get("originaldate", [""])[0]
 
-            # --- Optimization: Single Open for Advanced Metadata (Cover, Lyrics, Duration) ---
+            # --- Optimization: Single Open for Basic + Advanced Metadata (Cover, Lyrics, Duration) ---
             try:
-                audio_full = mutagen.File(filepath)
-                
                 # 1. Duration
                 if audio_full and audio_full.info:
                     tags['duration'] = audio_full.info.length
@@ -37,47 +241,33 @@ class AudioHandler:
                     tags['duration'] = 0
 
                 # 2. Cover Art
-                if filepath.lower().endswith('.mp3'):
-                    if hasattr(audio_full, 'tags'):
-                        for k in audio_full.tags.keys():
-                            if k.startswith('APIC'):
-                                pic = audio_full.tags[k]
-                                from PIL import Image
-                                import io
-                                try:
-                                    img = Image.open(io.BytesIO(pic.data))
-                                    if img.size == (500, 500):
-                                        tags['cover_status'] = 2
-                                    else:
-                                        tags['cover_status'] = 1
-                                except:
-                                    pass # Corrupt image data
-                                break
-                elif filepath.lower().endswith('.flac'):
-                    if audio_full.pictures:
-                        from PIL import Image
-                        import io
-                        try:
-                            img = Image.open(io.BytesIO(audio_full.pictures[0].data))
-                            if img.size == (500, 500):
-                                tags['cover_status'] = 2
-                            else:
-                                tags['cover_status'] = 1
-                        except:
-                            pass
+                handlers = FORMAT_HANDLERS.get(ext)
+                cover_data = handlers.get_cover(audio_full) if handlers else None
+                if cover_data:
+                    from PIL import Image
+                    import io
+                    try:
+                        img = Image.open(io.BytesIO(cover_data))
+                        if img.size == (500, 500):
+                            tags['cover_status'] = 2
+                        else:
+                            tags['cover_status'] = 1
+                    except:
+                        pass # Corrupt image data
 
                 # 3. Lyrics
                 lyrics_text = ""
-                if filepath.lower().endswith('.mp3'):
+                if ext == '.mp3':
                     for k in audio_full.tags.keys():
-                        if k.startswith('USLT'):
+                        frame_id = k[:4] # Keys look like 'USLT::eng'
+                        if frame_id == ID3_LYRICS:
                             lyrics_text = str(audio_full.tags[k])
                             break
-                        elif k.startswith('SYLT'):
+                        elif frame_id == ID3_SYNCED_LYRICS:
                             lyrics_text = "[Synced Lyrics Present]" 
                             tags['lyrics_status'] = 2
                             break
-                elif filepath.lower().endswith('.flac'):
+                elif ext == '.flac':
                     if 'lyrics' in audio_full:
                         lyrics_text = audio_full['lyrics'][0]
                 
@@ -96,11 +286,25 @@ class AudioHandler:
                 print(f"Error reading advanced metadata for {filepath}: {e}")
                 tags['duration'] = 0
             
+            _store_tags(filepath, stamp, tags)
             return tags
         except Exception:
             return {"filename": os.path.basename(filepath), "path": filepath}
 
-    def save_tags(self, filepath, tags):
+    def get_tags_many(self, filepaths):
+        # Reads are disk/parse bound, so threads overlap the I/O; results come
+        # back in input order, and paths are taken in chunks to bound pending work
+        paths = iter(filepaths)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=_READ_WORKERS) as executor:
+            while True:
+                chunk = list(itertools.islice(paths, _READ_CHUNK))
+                if not chunk:
+                    break
+                yield from executor.map(self.get_tags, chunk)
+
+    def update_tags(self, filepath, updates):
+        # Writes only the given fields; unlike save_tags it needs no full tag
+        # set first, so callers changing a few fields skip the read pass
         try:
             audio = mutagen.File(filepath, easy=True)
             if not audio:
@@ -108,64 +312,79 @@ class AudioHandler:
                 if not audio: return False
                 audio.add_tags()
             
-            audio["title"] = tags.get("title", "")
-            audio["artist"] = tags.get("artist", "")
-            audio["album"] = tags.get("album", "")
-            audio["albumartist"] = tags.get("albumartist", "")
-            audio["date"] = tags.get("year", "")
-            audio["genre"] = tags.get("genre", "")
+            for key, value in updates.items():
+                audio[EASY_KEYS.get(key, key)] = value
             
             audio.save()
-            
-            # Handle Lyrics (Not easy ID3)
-            audio_full = mutagen.File(filepath)
-            lyrics = tags.get("lyrics", "")
-            
-            if filepath.lower().endswith('.mp3'):
-                from mutagen.id3 import USLT
-                if not audio_full.tags: audio_full.add_tags()
+            return True
+        except Exception as e:
+            print(f"Save Error: {e}")
+            return False
+        finally:
+            _invalidate(filepath)
+
+    def save_tags(self, filepath, tags):
+        ext = os.path.splitext(filepath)[1].lower()
+        lyrics = tags.get("lyrics", "")
+        try:
+            if ext == '.mp3':
+                # Write text frames and lyrics on one ID3 object so the file is
+                # parsed and rewritten once (easy ID3 cannot hold USLT)
+                from mutagen import id3
+                audio = mutagen.File(filepath)
+                if not audio: return False
+                if audio.tags is None: audio.add_tags()
+                
+                for key, frame_id in ID3_TEXT_FRAMES.items():
+                    audio.tags.add(id3.Frames[frame_id](encoding=3, text=tags.get(key, "")))
                 
+                # Remove existing USLT frames first to avoid duplicates
+                audio.tags.delall(ID3_LYRICS)
                 if lyrics:
-                    # Remove existing USLT frames first to avoid duplicates
-                    to_del = [k for k in audio_full.tags.keys() if k.startswith('USLT')]
-                    for k in to_del: del audio_full.tags[k]
-                    
-                    audio_full.tags.add(USLT(encoding=3, lang='eng', desc='', text=lyrics))
-                else:
-                    to_del = [k for k in audio_full.tags.keys() if k.startswith('USLT')]
-                    for k in to_del: del audio_full.tags[k]
-                audio_full.save()
-            elif filepath.lower().endswith('.flac'):
-                audio_full['lyrics'] = lyrics
-                audio_full.save()
+                    audio.tags.add(id3.USLT(encoding=3, lang='eng', desc='', text=lyrics))
+            else:
+                audio = mutagen.File(filepath, easy=True)
+                if not audio:
+                    audio = mutagen.File(filepath)
+                    if not audio: return False
+                    audio.add_tags()
+                
+                for key in TAG_FIELDS:
+                    audio[EASY_KEYS.get(key, key)] = tags.get(key, "")
                 
+                if ext == '.flac':
+                    # Vorbis comments take lyrics directly, no second pass needed
+                    audio['lyrics'] = lyrics
+            
+            audio.save()
             return True
         except Exception as e:
             print(f"Save Error: {e}")
             return False
+        finally:
+            _invalidate(filepath)
 
     def get_cover(self, filepath):
+        global _last_cover
+        handlers = FORMAT_HANDLERS.get(os.path.splitext(filepath)[1].lower())
+        if not handlers: return None
         try:
-            audio = mutagen.File(filepath)
+            stamp = _stamp(filepath)
+            with _cache_lock:
+                if _last_cover[:2] == (filepath, stamp):
+                    return _last_cover[2]
+            audio = _load(filepath)
             if not audio: return None
-            
-            if filepath.lower().endswith('.mp3'):
-                if hasattr(audio, 'tags'):
-                    for t in audio.tags.values():
-                        if t.FrameID == 'APIC':
-                            return t.data
-            elif filepath.lower().endswith('.flac'):
-                if audio.pictures:
-                    return audio.pictures[0].data
-            elif filepath.lower().endswith('.m4a'):
-                if 'covr' in audio.tags:
-                    return bytes(audio.tags['covr'][0])
-            
-            return None
+            data = handlers.get_cover(audio)
+            with _cache_lock:
+                _last_cover = (filepath, stamp, data)
+            return data
         except Exception:
             return None
 
     def set_cover(self, filepath, image_data, mime_type='image/jpeg'):
+        handlers = FORMAT_HANDLERS.get(os.path.splitext(filepath)[1].lower())
+        if not handlers: return False
         try:
             from PIL import Image
             import io
@@ -185,65 +404,35 @@ class AudioHandler:
             audio = mutagen.File(filepath)
             if not audio: return False
             
-            if filepath.lower().endswith('.mp3'):
-                from mutagen.id3 import APIC
-                if not audio.tags: audio.add_tags()
-                audio.tags.add(APIC(encoding=3, mime=mime_type, type=3, desc='Cover', data=image_data))
-            elif filepath.lower().endswith('.flac'):
-                from mutagen.flac import Picture
-                pic = Picture()
-                pic.type = 3
-                pic.mime = mime_type
-                pic.desc = 'Cover'
-                pic.data = image_data
-                audio.clear_pictures()
-                audio.add_picture(pic)
-            elif filepath.lower().endswith('.m4a'):
-                from mutagen.mp4 import MP4Cover
-                fmt = MP4Cover.FORMAT_JPEG if mime_type == 'image/jpeg' else MP4Cover.FORMAT_PNG
-                audio.tags['covr'] = [MP4Cover(image_data, imageformat=fmt)]
-            
+            handlers.set_cover(audio, image_data, mime_type)
             audio.save()
             return True
         except Exception:
             return False
+        finally:
+            _invalidate(filepath)
 
     def get_lyrics(self, filepath):
+        handlers = FORMAT_HANDLERS.get(os.path.splitext(filepath)[1].lower())
+        if not handlers: return ""
         try:
-            audio = mutagen.File(filepath)
+            audio = _load(filepath)
             if not audio: return ""
-            
-            if filepath.lower().endswith('.mp3'):
-                if hasattr(audio, 'tags'):
-                    for key in audio.tags.keys():
-                        if key.startswith('USLT'):
-                            return audio.tags[key].text
-            elif filepath.lower().endswith('.m4a'):
-                if '\xa9lyr' in audio.tags:
-                    return audio.tags['\xa9lyr'][0]
-            elif filepath.lower().endswith('.flac'):
-                if 'lyrics' in audio:
-                    return audio['lyrics'][0]
-            
-            return ""
+            return handlers.get_lyrics(audio)
         except Exception:
             return ""
 
     def save_lyrics(self, filepath, lyrics):
+        handlers = FORMAT_HANDLERS.get(os.path.splitext(filepath)[1].lower())
+        if not handlers: return False
         try:
             audio = mutagen.File(filepath)
             if not audio: return False
             
-            if filepath.lower().endswith('.mp3'):
-                from mutagen.id3 import USLT
-                if not audio.tags: audio.add_tags()
-                audio.tags.add(USLT(encoding=3, lang='eng', desc='', text=lyrics))
-            elif filepath.lower().endswith('.m4a'):
-                audio.tags['\xa9lyr'] = [lyrics]
-            elif filepath.lower().endswith('.flac'):
-                audio['lyrics'] = [lyrics]
-            
+            handlers.set_lyrics(audio, lyrics)
             audio.save()
             return True
         except Exception:
             return False
+        finally:
+            _invalidate(filepath)
@@ -0,0 +1,21 @@
+import io
+from PIL import Image
+
+COVER_SIZE = 500
+
+def resize_cover(data, size=COVER_SIZE, quality=90):
+    img = Image.open(io.BytesIO(data))
+    # JPEGs at or below the target size are returned as is (callers check
+    # identity): re-encoding would only upscale them and lose quality
+    if img.format == "JPEG" and max(img.size) <= size:
+        return data
+    if img.mode != "RGB":
+        img = img.convert("RGB") # JPEG cannot store alpha/palette images
+    
+    # reducing_gap lets Pillow shrink large sources with a cheap box reduce
+    # before the LANCZOS pass, which is where most of the time goes.
+    img = img.resize((size, size), Image.Resampling.LANCZOS, reducing_gap=3.0)
+    
+    out = io.BytesIO()
+    img.save(out, format="JPEG", quality=quality, optimize=True)
+    return out.getvalue()
@@ -1,10 +1,91 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import urllib.parse
 import tempfile
+import hashlib
+import shutil
+import threading
+import time
 import os
 
 from core.config import ConfigManager
 
+# Shared by every MetadataHandler so connections (and their TLS sessions) to
+# MusicBrainz, Cover Art Archive, iTunes and LRCLIB are reused across calls.
+_session = requests.Session()
+# Retry failed connects and gateway errors only. A read timeout already cost
+# the full timeout, and retrying it would hold up Auto Fetch before the
+# fallback source gets tried.
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8,
+                       max_retries=Retry(total=3, read=0, backoff_factor=1.0, status_forcelist=(502, 503, 504)))
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
+# MusicBrainz uses 503 for rate limiting; retrying it only adds load, so leave
+# pacing to _musicbrainz_get and retry just gateway errors there.
+_mb_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2,
+                          max_retries=Retry(total=3, read=0, backoff_factor=1.0, status_forcelist=(502, 504)))
+_session.mount("https://musicbrainz.org/", _mb_adapter)
+
+# MusicBrainz allows about one request per second per client and answers
+# anything faster with 503, so its queries are spaced out across all threads.
+_MB_MIN_INTERVAL = 1.0
+_mb_lock = threading.Lock()
+_mb_last_request = 0.0
+
+def _musicbrainz_get(url, **kwargs):
+    global _mb_last_request
+    with _mb_lock:
+        wait = _mb_last_request + _MB_MIN_INTERVAL - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _mb_last_request = time.monotonic()
+    return _session.get(url, **kwargs)
+
+COVER_CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "tagfix", "covers")
+# Entries are refetched after COVER_CACHE_MAX_AGE so a wrong or since updated
+# cover doesn't stick forever; the oldest go once the cache passes the size cap
+COVER_CACHE_MAX_AGE = 30 * 24 * 3600
+COVER_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+def _cover_cache_entries():
+    # (mtime, size, path) of every cached cover, oldest first
+    entries = []
+    try:
+        with os.scandir(COVER_CACHE_DIR) as it:
+            for entry in it:
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+    except OSError:
+        pass # No cache yet
+    return sorted(entries)
+
+def _prune_cover_cache():
+    entries = _cover_cache_entries()
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in entries:
+        if total <= COVER_CACHE_MAX_BYTES:
+            break
+        try:
+            os.unlink(path)
+            total -= size
+        except OSError:
+            pass
+
+def clear_cover_cache():
+    # Returns the number of cached covers removed
+    removed = 0
+    for _, _, path in _cover_cache_entries():
+        try:
+            os.unlink(path)
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
 class MetadataHandler:
     def __init__(self):
         self.mb_url = "https://musicbrainz.org/ws/2"
@@ -13,14 +94,47 @@ class MetadataHandler:
         self.headers = {'User-Agent': 'TagFix/1.0 (https://github.com/tagfix)'}
         self.config = ConfigManager()
 
-    def fetch_cover(self, artist, album):
+    def fetch_cover_bytes(self, artist, album, refresh=False):
+        # Cached per artist, album, size and source; refresh=True replaces the entry
+        force_500 = self.config.get("covers", "force_500px", True)
+        source = self.config.get("covers", "source", "iTunes")
+        key = f"{artist.strip().lower()}\x00{album.strip().lower()}\x00{500 if force_500 else 'full'}\x00{source}"
+        cache_path = os.path.join(COVER_CACHE_DIR, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".jpg")
+        if not refresh:
+            try:
+                if time.time() - os.path.getmtime(cache_path) < COVER_CACHE_MAX_AGE:
+                    with open(cache_path, 'rb') as f:
+                        return f.read()
+            except OSError:
+                pass # Missing or unreadable entry, fetch again
+        
+        path = self._fetch_cover_uncached(artist, album)
+        if not path:
+            return None
+        data = None
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.makedirs(COVER_CACHE_DIR, exist_ok=True)
+            shutil.move(path, cache_path)
+            os.utime(cache_path) # Age counts from when the cover was fetched
+            _prune_cover_cache()
+        except OSError as e:
+            print(f"Cover cache error: {e}")
+        finally:
+            if os.path.exists(path):
+                os.unlink(path) # Not moved into the cache, don't leak the temp file
+        return data
+
+    def _fetch_cover_uncached(self, artist, album):
         source = self.config.get("covers", "source", "iTunes")
         
         if source == "iTunes":
             # iTunes First
             url = self.fetch_from_itunes(artist, album)
             if url:
-                if self._download_to_temp(url): return self._download_to_temp(url)
+                path = self._download_to_temp(url)
+                if path: return path
             
             print("iTunes failed or no result, falling back to MusicBrainz...")
             return self._fetch_from_musicbrainz(artist, album)
@@ -37,23 +151,32 @@ class MetadataHandler:
 
     def _download_to_temp(self, url):
         try:
-            resp = requests.get(url, headers=self.headers)
-            if resp.status_code == 200:
-                tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".jpg")
-                tmp.write(resp.content)
-                tmp.close()
-                return tmp.name
+            with _session.get(url, headers=self.headers, stream=True, timeout=15) as resp:
+                if resp.status_code == 200:
+                    return self._stream_to_temp(resp)
         except Exception as e:
             print(f"Download error: {e}")
         return None
 
+    def _stream_to_temp(self, resp):
+        # Write the body to disk as it arrives instead of holding it all in memory
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as tmp:
+            try:
+                for chunk in resp.iter_content(chunk_size=64 * 1024):
+                    tmp.write(chunk)
+            except Exception:
+                tmp.close()
+                os.unlink(tmp.name) # Don't leave a truncated image behind
+                raise
+        return tmp.name
+
     def fetch_from_itunes(self, artist, album):
         try:
             term = f"{artist} {album}"
             encoded = urllib.parse.quote(term)
             url = f"https://itunes.apple.com/search?term={encoded}&entity=album&limit=1"
             
-            resp = requests.get(url, timeout=5)
+            resp = _session.get(url, timeout=5)
             if resp.status_code == 200:
                 data = resp.json()
                 if data.get('resultCount', 0) > 0:
@@ -74,7 +197,7 @@ class MetadataHandler:
             encoded = urllib.parse.quote(query)
             url = f"{self.mb_url}/release?query={encoded}&fmt=json&limit=1"
             
-            resp = requests.get(url, headers=self.headers)
+            resp = _musicbrainz_get(url, headers=self.headers)
             if resp.status_code == 200:
                 data = resp.json()
                 releases = data.get('releases', [])
@@ -91,21 +214,14 @@ class MetadataHandler:
         cover_url = f"{self.cover_url}/release/{mbid}/{suffix}"
         
         try:
-            img_resp = requests.get(cover_url, headers=self.headers)
-            if img_resp.status_code == 200:
-                tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".jpg")
-                tmp.write(img_resp.content)
-                tmp.close()
-                return tmp.name
-            elif force_500 and img_resp.status_code == 404:
+            with _session.get(cover_url, headers=self.headers, stream=True, timeout=15) as img_resp:
+                if img_resp.status_code == 200:
+                    return self._stream_to_temp(img_resp)
+                not_found = img_resp.status_code == 404
+            if force_500 and not_found:
                 # Fallback to original if 500px not found
                 cover_url = f"{self.cover_url}/release/{mbid}/front"
-                img_resp = requests.get(cover_url, headers=self.headers)
-                if img_resp.status_code == 200:
-                    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".jpg")
-                    tmp.write(img_resp.content)
-                    tmp.close()
-                    return tmp.name
+                return self._download_to_temp(cover_url)
         except:
             pass
         return None
@@ -120,7 +236,7 @@ class MetadataHandler:
             encoded = urllib.parse.quote(query)
             url = f"{self.mb_url}/release?query={encoded}&fmt=json&limit=10"
             
-            resp = requests.get(url, headers=self.headers)
+            resp = _musicbrainz_get(url, headers=self.headers)
             if resp.status_code == 200:
                 data = resp.json()
                 return data.get('releases', [])
@@ -134,13 +250,13 @@ class MetadataHandler:
         cover_url = f"{self.cover_url}/release/{mbid}/{suffix}"
         
         try:
-            resp = requests.get(cover_url, headers=self.headers)
+            resp = _session.get(cover_url, headers=self.headers)
             if resp.status_code == 200:
                 return resp.content
             elif force_500 and resp.status_code == 404:
                 # Fallback
                 cover_url = f"{self.cover_url}/release/{mbid}/front"
-                resp = requests.get(cover_url, headers=self.headers)
+                resp = _session.get(cover_url, headers=self.headers)
                 if resp.status_code == 200:
                     return resp.content
         except Exception as e:
@@ -153,7 +269,7 @@ class MetadataHandler:
                 'q': f"{artist} {title} {album}".strip()
             }
             url = f"{self.lrc_url}/search"
-            resp = requests.get(url, params=params, headers=self.headers)
+            resp = _session.get(url, params=params, headers=self.headers)
             if resp.status_code == 200:
                 return resp.json()
         except Exception as e:
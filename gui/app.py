@@ -4,7 +4,7 @@ import os
 from gui.tabs.browser import BrowserTab
 from gui.tabs.editor import EditorTab
 from gui.table import TrackTable
-from core.audio import AudioHandler
+from core.audio import AudioHandler, find_audio_files
 
 class TagFixApp:
     def __init__(self, root):
@@ -151,14 +151,9 @@ class TagFixApp:
         self.table.clear()
         self.tracks_cache = {}
         try:
-            supported_exts = ('.mp3', '.flac', '.m4a', '.ogg', '.wav')
-            for root, dirs, files in os.walk(path):
-                for f in files:
-                    if f.lower().endswith(supported_exts):
-                        fullpath = os.path.join(root, f)
-                        tags = self.audio_handler.get_tags(fullpath)
-                        item_id = self.table.add_track(tags)
-                        self.tracks_cache[item_id] = tags
+            for tags in self.audio_handler.get_tags_many(find_audio_files(path)):
+                item_id = self.table.add_track(tags)
+                self.tracks_cache[item_id] = tags
         except OSError:
             pass
 
@@ -176,11 +171,10 @@ class TagFixApp:
         if not tags: return
 
         # Update cache
-        # We need to find the item_id for this filepath
-        for item_id, data in self.tracks_cache.items():
-            if data["path"] == filepath:
-                self.tracks_cache[item_id] = tags
-                break
+        # The table indexes its rows by path, so no need to scan the cache
+        item_id = self.table.path_items.get(filepath)
+        if item_id in self.tracks_cache:
+            self.tracks_cache[item_id] = tags
         
         # If the updated file is currently loaded in the editor, reload it
         if self.editor.current_track and self.editor.current_track["path"] == filepath:
@@ -1,23 +1,59 @@
 import tkinter as tk
 from tkinter import ttk
 import threading
+import concurrent.futures
 import os
-from core.audio import AudioHandler
-from core.metadata import MetadataHandler
-import io
-from PIL import Image
+import re
+from core.audio import AudioHandler, TAG_FIELDS
+
+# Tag and cover writes are independent per file and disk bound
+WRITE_WORKERS = 8
+
+# resize_one result for small JPEG covers that are deliberately not upscaled
+SKIPPED_SMALL = "skipped"
+
+# Fields a filename pattern can fill: the basic tags plus the track number,
+# which update_tags writes through the easy "tracknumber" key
+PATTERN_FIELDS = TAG_FIELDS + ("tracknumber",)
+PATTERN_ALIASES = {"track": "tracknumber"}
+# Placeholder for filename parts that should not be written anywhere
+PATTERN_IGNORE = "ignore"
+# Fields with a known shape; everything else matches any text
+PATTERN_FIELD_REGEX = {"tracknumber": r"\d+"}
+
+def compile_filename_pattern(pattern):
+    # '{track} - {artist} - {title}' -> regex over the filename stem with one
+    # named group per field. Returns (regex, unknown placeholder names).
+    regex = ""
+    seen = set()
+    unknown = []
+    for part in re.split(r"(\{\w+\})", pattern):
+        name = part[1:-1] if part.startswith("{") and part.endswith("}") else None
+        if name is None:
+            regex += re.escape(part)
+            continue
+        field = PATTERN_ALIASES.get(name, name)
+        group = PATTERN_FIELD_REGEX.get(field, ".+?")
+        if field == PATTERN_IGNORE or field in seen:
+            regex += group
+        elif field in PATTERN_FIELDS:
+            seen.add(field)
+            regex += f"(?P<{field}>{group})"
+        else:
+            unknown.append(name)
+    return re.compile(regex), unknown
 
 class BatchEditDialog(tk.Toplevel):
-    def __init__(self, parent, file_paths, status_map=None, on_update=None):
+    def __init__(self, parent, file_paths, status_map=None, titles=None, on_update=None):
         super().__init__(parent)
         self.title("Batch Editor")
         self.geometry("600x700")
         self.configure(bg='#1e1e1e')
         self.file_paths = file_paths
         self.status_map = status_map or {}
+        self.titles = titles or {}
         self.on_update = on_update
         self.audio_handler = AudioHandler()
-        self.metadata_handler = MetadataHandler()
         
         # Make modal
         self.transient(parent)
@@ -42,11 +78,18 @@ class BatchEditDialog(tk.Toplevel):
             ent.grid(row=i, column=1, sticky="ew", padx=5, pady=2)
             self.entries[field.lower()] = ent
             
+        # Per-file values parsed from the filename, e.g. "{artist} - {title}"
+        ttk.Label(control_frame, text="Filename Pattern").grid(row=len(fields), column=0, sticky="w", padx=5, pady=2)
+        self.pattern_entry = ttk.Entry(control_frame)
+        self.pattern_entry.grid(row=len(fields), column=1, sticky="ew", padx=5, pady=2)
+        ttk.Label(control_frame, text="e.g. {track} - {artist} - {title}  (fields: track, " + ", ".join(TAG_FIELDS) + ", ignore)",
+                  font=("", 8)).grid(row=len(fields) + 1, column=1, sticky="w", padx=5)
+            
         control_frame.columnconfigure(1, weight=1)
         
         # Bulk Actions
         action_frame = ttk.Frame(control_frame)
-        action_frame.grid(row=len(fields), column=0, columnspan=2, sticky="ew", pady=10)
+        action_frame.grid(row=len(fields) + 2, column=0, columnspan=2, sticky="ew", pady=10)
         
         ttk.Button(action_frame, text="Fetch All Covers (iTunes)", command=self.fetch_all_covers).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
         ttk.Button(action_frame, text="Resize All Covers (500x500)", command=self.resize_all_covers).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
@@ -82,76 +125,139 @@ class BatchEditDialog(tk.Toplevel):
         ttk.Button(footer_frame, text="Cancel", command=self.destroy).pack(side=tk.RIGHT, padx=5)
         
     def _populate_list(self):
+        # Titles from the caller's table avoid re-reading every file; only read what is missing
+        missing = [p for p in self.file_paths if p not in self.titles]
+        for tags in self.audio_handler.get_tags_many(missing):
+            self.titles[tags["path"]] = tags.get("title", "")
+        
         for path in self.file_paths:
-            tags = self.audio_handler.get_tags(path)
-            self.tree.insert("", "end", values=(os.path.basename(path), tags.get("title", "")))
+            self.tree.insert("", "end", values=(os.path.basename(path), self.titles[path]))
             
     def apply_changes(self):
         # Get values to update
         updates = {k: e.get().strip() for k, e in self.entries.items() if e.get().strip()}
+        pattern = self.pattern_entry.get().strip()
         
-        if not updates:
+        if not updates and not pattern:
             self.status_label.configure(text="No changes to apply.")
             return
+        
+        regex = None
+        if pattern:
+            regex, unknown = compile_filename_pattern(pattern)
+            if unknown:
+                # A typo would otherwise match everything and half-fill the tags
+                names = ", ".join("{%s}" % n for n in unknown)
+                self.status_label.configure(text=f"Unknown pattern fields: {names}")
+                return
             
         self.status_label.configure(text="Applying changes...")
         
+        def apply_one(path):
+            # Returns (filename matched the pattern, file was written)
+            file_updates = {}
+            matched = False
+            if regex:
+                stem = os.path.splitext(os.path.basename(path))[0]
+                m = regex.fullmatch(stem)
+                if m:
+                    matched = True
+                    # Whitespace-only captures would blank the tag, skip them
+                    file_updates = {k: v.strip() for k, v in m.groupdict().items() if v.strip()}
+            # Explicit batch values win over values parsed from the filename
+            file_updates.update(updates)
+            if not file_updates:
+                return matched, False
+            
+            # Write only the changed fields: one open and one save per file
+            return matched, self.audio_handler.update_tags(path, file_updates)
+            
         def worker():
-            count = 0
-            modified_paths = []
-            for path in self.file_paths:
-                tags = self.audio_handler.get_tags(path)
-                # Apply updates
-                for k, v in updates.items():
-                    tags[k] = v
-                
-                if self.audio_handler.save_tags(path, tags):
-                    count += 1
-                    modified_paths.append(path)
-                    
-            self.after(0, lambda: self._on_complete(f"Updated {count} files.", modified_paths))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=WRITE_WORKERS) as executor:
+                results = list(executor.map(apply_one, self.file_paths))
+            modified_paths = [p for p, (_, ok) in zip(self.file_paths, results) if ok]
+            count = len(modified_paths)
+            matched = sum(1 for m, _ in results if m)
+            
+            if regex and not matched:
+                # Keep the dialog open so the pattern can be corrected
+                message = f"Pattern matched none of the {len(self.file_paths)} filenames."
+                if count:
+                    message = f"Updated {count} files. " + message
+                self.after(0, lambda: self._on_pattern_miss(message, modified_paths))
+                return
+            
+            message = f"Updated {count} files."
+            if regex:
+                message += f" Pattern matched {matched} of {len(self.file_paths)} filenames."
+            self.after(0, lambda: self._on_complete(message, modified_paths))
             
         t = threading.Thread(target=worker)
         t.daemon = True
         t.start()
         
+    def _on_pattern_miss(self, message, modified_paths):
+        self.status_label.configure(text=message)
+        if modified_paths and self.on_update:
+            self.on_update(modified_paths)
+        
     def fetch_all_covers(self):
+        # Network stack (requests/urllib3) is only loaded when covers are fetched
+        from core.metadata import MetadataHandler
+        metadata_handler = MetadataHandler()
         self.status_label.configure(text="Fetching covers...")
         
-        def worker():
-            count = 0
-            modified_paths = []
-            for path in self.file_paths:
-                # Optimization: Check cached status first
-                status = self.status_map.get(path)
-                if status:
-                    c_stat = status[0]
-                    # Green (2) or Yellow (1) -> Skip (User requirement: "If Status is Green... SKIP", "If Status is Yellow... SKIP")
-                    # Only process if Red (0)
-                    if c_stat != 0:
-                        continue
-                else:
-                    # Fallback to disk check if no cache
-                    tags = self.audio_handler.get_tags(path)
-                    if tags.get('cover_status', 0) != 0:
-                        continue
-
+        def needs_cover(path):
+            # Optimization: Check cached status first
+            status = self.status_map.get(path)
+            if status:
+                c_stat = status[0]
+                # Green (2) or Yellow (1) -> Skip (User requirement: "If Status is Green... SKIP", "If Status is Yellow... SKIP")
+                # Only process if Red (0)
+                if c_stat != 0:
+                    return None
+            else:
+                # Fallback to disk check if no cache
                 tags = self.audio_handler.get_tags(path)
-                artist = tags.get("artist")
-                album = tags.get("album")
+                if tags.get('cover_status', 0) != 0:
+                    return None
+
+            tags = self.audio_handler.get_tags(path)
+            artist = tags.get("artist")
+            album = tags.get("album")
+            if artist and album:
+                return (artist, album)
+            return None
+            
+        def fetch_album(key):
+            # One download and one read per album, shared by all of its tracks
+            artist, album = key
+            # Source order (iTunes or MusicBrainz first) follows the cover settings
+            return metadata_handler.fetch_cover_bytes(artist, album)
+            
+        def embed_one(target):
+            path, data = target
+            if self.audio_handler.set_cover(path, data):
+                # Update status map for subsequent ops
+                self.status_map[path] = (2, self.status_map.get(path, (0,0))[1])
+                return True
+            return False
+            
+        def worker():
+            albums = {}
+            with concurrent.futures.ThreadPoolExecutor(max_workers=WRITE_WORKERS) as executor:
+                for path, key in zip(self.file_paths, executor.map(needs_cover, self.file_paths)):
+                    if key:
+                        albums.setdefault(key, []).append(path)
                 
-                if artist and album:
-                    # Use the new fetch_cover logic (iTunes priority)
-                    cover_path = self.metadata_handler.fetch_cover(artist, album)
-                    if cover_path:
-                        with open(cover_path, 'rb') as f:
-                            data = f.read()
-                        if self.audio_handler.set_cover(path, data):
-                            count += 1
-                            modified_paths.append(path)
-                            # Update status map for subsequent ops
-                            self.status_map[path] = (2, self.status_map.get(path, (0,0))[1])
-                        os.unlink(cover_path)
+                # Lookups stay sequential: iTunes and MusicBrainz rate-limit
+                # parallel clients, only the local writes go to the pool
+                covers = {key: fetch_album(key) for key in albums}
+                
+                targets = [(path, covers[key]) for key, paths in albums.items() if covers[key] for path in paths]
+                results = list(executor.map(embed_one, targets))
+            modified_paths = [path for (path, _), ok in zip(targets, results) if ok]
+            count = len(modified_paths)
                         
             self.after(0, lambda: self._on_complete(f"Fetched {count} covers.", modified_paths))
             
@@ -160,47 +266,53 @@ class BatchEditDialog(tk.Toplevel):
         t.start()
         
     def resize_all_covers(self):
+        from core.covers import resize_cover
         self.status_label.configure(text="Resizing covers...")
         
-        def worker():
-            count = 0
-            modified_paths = []
-            for path in self.file_paths:
-                # Optimization: Check cached status first
-                status = self.status_map.get(path)
-                if status:
-                    c_stat = status[0]
-                    # Green (2) -> Skip
-                    # Red (0) -> Skip
-                    # Yellow (1) -> Process
-                    if c_stat != 1:
-                        continue
-                else:
-                    # Fallback
-                    tags = self.audio_handler.get_tags(path)
-                    c_stat = tags.get('cover_status', 0)
-                    if c_stat == 2: continue # Already 500x500
+        def resize_one(path):
+            # Returns True if resized, SKIPPED_SMALL for small JPEGs left as is
+            # Optimization: Check cached status first
+            status = self.status_map.get(path)
+            if status:
+                c_stat = status[0]
+                # Green (2) -> Skip
+                # Red (0) -> Skip
+                # Yellow (1) -> Process
+                if c_stat != 1:
+                    return False
+            else:
+                # Fallback
+                tags = self.audio_handler.get_tags(path)
+                c_stat = tags.get('cover_status', 0)
+                if c_stat == 2: return False # Already 500x500
+                
+            data = self.audio_handler.get_cover(path)
+            if data:
+                try:
+                    # Resize to 500x500
+                    new_data = resize_cover(data)
+                    if new_data is data:
+                        return SKIPPED_SMALL # JPEG under 500px, don't upscale it
                     
-                data = self.audio_handler.get_cover(path)
-                if data:
-                    try:
-                        img = Image.open(io.BytesIO(data))
-                        # Resize to 500x500
-                        img = img.resize((500, 500), Image.Resampling.LANCZOS)
-                        
-                        out = io.BytesIO()
-                        img.save(out, format="JPEG", quality=90)
-                        new_data = out.getvalue()
-                        
-                        if self.audio_handler.set_cover(path, new_data):
-                            count += 1
-                            modified_paths.append(path)
-                            # Update status map
-                            self.status_map[path] = (2, self.status_map.get(path, (0,0))[1])
-                    except Exception:
-                        pass
-                        
-            self.after(0, lambda: self._on_complete(f"Resized {count} covers.", modified_paths))
+                    if self.audio_handler.set_cover(path, new_data):
+                        # Update status map
+                        self.status_map[path] = (2, self.status_map.get(path, (0,0))[1])
+                        return True
+                except Exception:
+                    pass
+            return False
+            
+        def worker():
+            with concurrent.futures.ThreadPoolExecutor(max_workers=WRITE_WORKERS) as executor:
+                results = list(executor.map(resize_one, self.file_paths))
+            modified_paths = [p for p, ok in zip(self.file_paths, results) if ok is True]
+            count = len(modified_paths)
+            skipped = results.count(SKIPPED_SMALL)
+            
+            message = f"Resized {count} covers."
+            if skipped:
+                message += f" Kept {skipped} JPEG covers already under 500px."
+            self.after(0, lambda: self._on_complete(message, modified_paths))
             
         t = threading.Thread(target=worker)
         t.daemon = True
@@ -126,6 +126,18 @@ class SettingsDialog(tk.Toplevel):
         combo['values'] = ("iTunes", "MusicBrainz")
         combo.pack(fill=tk.X, padx=10, pady=5)
         
+        # Cover Cache
+        ttk.Button(frame, text="Clear Cover Cache", command=self.clear_cover_cache).pack(anchor="w", padx=10, pady=(15, 5))
+        self.cache_label = ttk.Label(frame, text="Fetched covers are reused for 30 days.",
+                                     foreground="#888888", font=("", 9))
+        self.cache_label.pack(anchor="w", padx=10)
+        
+    def clear_cover_cache(self):
+        # Imported here so opening Settings doesn't load the network stack
+        from core.metadata import clear_cover_cache
+        removed = clear_cover_cache()
+        self.cache_label.configure(text=f"Removed {removed} cached covers.")
+        
     def _build_lyrics_tab(self):
         frame = ttk.LabelFrame(self.tab_lyrics, text="Batch Behavior")
         frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
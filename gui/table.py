@@ -82,7 +82,9 @@ class TrackTable(ttk.Frame):
 
         self.icon_cache = [] # Keep references to PhotoImage objects to prevent garbage collection
         self.item_paths = {} # Store full paths for items
+        self.path_items = {} # Reverse of item_paths, so lookups by path don't scan every row
         self.item_status = {} # Store (cover_status, lyrics_status)
+        self.row_count = 0 # Rows added since last clear, for zebra striping
 
         # Settings Button
         settings_button = ttk.Button(self, text="Settings", command=self.show_settings)
@@ -147,18 +149,20 @@ class TrackTable(ttk.Frame):
             
         file_paths = []
         status_map = {}
+        titles = {}
         for item in items:
             path = self.item_paths.get(item)
             status = self.item_status.get(item)
             if path:
                 file_paths.append(path)
+                titles[path] = self.tree.set(item, "title") # Already read on folder load
                 if status:
                     status_map[path] = status
                 
         if not file_paths: return
         
         from gui.dialogs.batch_edit import BatchEditDialog
-        BatchEditDialog(self.winfo_toplevel(), file_paths, status_map=status_map, on_update=self.on_batch_update)
+        BatchEditDialog(self.winfo_toplevel(), file_paths, status_map=status_map, titles=titles, on_update=self.on_batch_update)
 
     def on_batch_update(self, modified_paths=None):
         if modified_paths:
@@ -332,11 +336,7 @@ class TrackTable(ttk.Frame):
 
     def refresh_row(self, filepath):
         # Find item
-        target_item = None
-        for item, path in self.item_paths.items():
-            if path == filepath:
-                target_item = item
-                break
+        target_item = self.path_items.get(filepath)
         
         if target_item and self.tree.exists(target_item):
             # Re-read tags to get fresh status
@@ -409,18 +409,20 @@ class TrackTable(ttk.Frame):
             tags.get("year", ""),
             tags.get("genre", "")
         )
-        # Zebra Striping
-        idx = len(self.tree.get_children())
-        tag = 'even' if idx % 2 == 0 else 'odd'
+        # Zebra Striping (counted, get_children() would copy every row per insert)
+        tag = 'even' if self.row_count % 2 == 0 else 'odd'
+        self.row_count += 1
         
         # Use text="" for column #0 (icon only)
         item = self.tree.insert("", "end", text="", image=icon, values=values, tags=(tag,))
         self.item_paths[item] = tags["path"] # Store path
+        self.path_items[tags["path"]] = item
         self.item_status[item] = (c_stat, l_stat) # Store status
         return item
 
     def clear(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.tree.delete(*self.tree.get_children())
         self.item_paths.clear()
+        self.path_items.clear()
         self.item_status.clear()
+        self.row_count = 0
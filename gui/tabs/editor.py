@@ -83,11 +83,7 @@ class EditorTab(ttk.Frame):
             if data:
                 try:
                     img = Image.open(io.BytesIO(data))
-                    self.resolution_label.configure(text=f"{img.width}x{img.height}")
-                    img.thumbnail((200, 200))
-                    photo = ImageTk.PhotoImage(img)
-                    self.cover_label.configure(image=photo, text="")
-                    self.cover_label.image = photo
+                    self._show_cover(img)
                 except Exception:
                     self.cover_label.configure(image="", text="[Error]")
                     self.resolution_label.configure(text="")
@@ -163,11 +159,7 @@ class EditorTab(ttk.Frame):
         if self.audio_handler.set_cover(self.current_track["path"], data):
             try:
                 img = Image.open(io.BytesIO(data))
-                self.resolution_label.configure(text=f"{img.width}x{img.height}")
-                img.thumbnail((200, 200))
-                photo = ImageTk.PhotoImage(img)
-                self.cover_label.configure(image=photo, text="")
-                self.cover_label.image = photo
+                self._show_cover(img)
                 self.show_toast("Cover Updated")
                 
                 # Notify parent to refresh the specific row
@@ -189,13 +181,10 @@ class EditorTab(ttk.Frame):
         def worker():
             from core.metadata import MetadataHandler
             handler = MetadataHandler()
-            path = handler.fetch_cover(artist, album)
-            if path:
-                with open(path, 'rb') as f:
-                    data = f.read()
+            # Auto Fetch is also how users retry a wrong cover, so bypass the cache
+            data = handler.fetch_cover_bytes(artist, album, refresh=True)
+            if data:
                 self.after(0, lambda: self._on_cover_selected(data))
-                import os
-                os.unlink(path) # Cleanup temp file
             else:
                 self.after(0, lambda: self.show_toast("Cover Not Found"))
                 
@@ -224,13 +213,12 @@ class EditorTab(ttk.Frame):
             data = self.audio_handler.get_cover(self.current_track["path"])
             if data:
                 try:
-                    img = Image.open(io.BytesIO(data))
-                    img = img.resize((500, 500), Image.Resampling.LANCZOS)
-                    
-                    # Save to bytes
-                    out = io.BytesIO()
-                    img.save(out, format="JPEG", quality=90)
-                    new_data = out.getvalue()
+                    from core.covers import resize_cover
+                    new_data = resize_cover(data)
+                    if new_data is data:
+                        self.after(0, lambda: self.show_toast("Cover Already 500px or Smaller"))
+                        return
+                    img = Image.open(io.BytesIO(new_data))
                     
                     if self.audio_handler.set_cover(self.current_track["path"], new_data):
                         self.after(0, lambda: self._on_resize_complete(img))
@@ -246,20 +234,21 @@ class EditorTab(ttk.Frame):
 
     def _on_resize_complete(self, img):
         # Update display
+        self._show_cover(img)
+        self.show_toast("Cover Resized")
+
+    def _show_cover(self, img):
         self.resolution_label.configure(text=f"{img.width}x{img.height}")
+        # thumbnail() already drafts JPEGs to a reduced decode scale, keeping
+        # a 2x margin over the preview size so the downscale stays sharp
         img.thumbnail((200, 200))
         photo = ImageTk.PhotoImage(img)
         self.cover_label.configure(image=photo, text="")
         self.cover_label.image = photo
-        self.show_toast("Cover Resized")
 
     def update_cover_display(self, path):
         try:
             img = Image.open(path)
-            self.resolution_label.configure(text=f"{img.width}x{img.height}")
-            img.thumbnail((200, 200))
-            photo = ImageTk.PhotoImage(img)
-            self.cover_label.configure(image=photo, text="")
-            self.cover_label.image = photo
+            self._show_cover(img)
         except Exception:
             pass